@@ -2,6 +2,7 @@
 Example: Running the AI Agent Software Team
 """
 
+import asyncio
 from ai_agent_team import AIAgentTeam
 from dotenv import load_dotenv
 
@@ -9,7 +10,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-def example_1_simple_function():
+async def example_1_simple_function():
     """Example 1: Simple function implementation"""
     print("\n" + "="*80)
     print("EXAMPLE 1: Simple Fibonacci Function")
@@ -27,12 +28,12 @@ def example_1_simple_function():
 
     # Specify project directory for output
     team = AIAgentTeam(project_dir="./output/fibonacci_example")
-    result = team.run(requirement)
+    result = await team.arun(requirement)
 
     print_summary(result)
 
 
-def example_2_class_design():
+async def example_2_class_design():
     """Example 2: Class-based implementation"""
     print("\n" + "="*80)
     print("EXAMPLE 2: Task Manager Class")
@@ -51,12 +52,12 @@ def example_2_class_design():
     """
 
     team = AIAgentTeam(project_dir="./output/task_manager_example")
-    result = team.run(requirement)
+    result = await team.arun(requirement)
 
     print_summary(result)
 
 
-def example_3_api_integration():
+async def example_3_api_integration():
     """Example 3: API integration"""
     print("\n" + "="*80)
     print("EXAMPLE 3: Weather API Client")
@@ -76,11 +77,24 @@ def example_3_api_integration():
     """
 
     team = AIAgentTeam(project_dir="./output/weather_api_example")
-    result = team.run(requirement)
+    result = await team.arun(requirement)
 
     print_summary(result)
 
 
+async def run_examples():
+    """Run the predefined examples concurrently
+
+    Each example is an independent pipeline with its own AIAgentTeam, so the
+    total wall time is that of the slowest example rather than the sum.
+    """
+    await asyncio.gather(
+        example_1_simple_function(),
+        example_2_class_design(),
+        example_3_api_integration()
+    )
+
+
 def print_summary(result: dict):
     """Print a summary of the workflow result"""
     print("\n" + "="*80)
@@ -129,7 +143,7 @@ def interactive_mode():
         dirname = re.sub(r'[^a-z0-9]+', '_', requirement[:50].lower()).strip('_')
         project_dir = f"./output/{dirname}"
 
-        team = AIAgentTeam(project_dir=project_dir)
+        team = AIAgentTeam(project_dir=project_dir, stream_output=True)
         result = team.run(requirement)
 
         print_summary(result)
@@ -147,8 +161,4 @@ if __name__ == "__main__":
         print("Running predefined examples...")
         print("(Use 'python examples.py interactive' for interactive mode)")
         
-        example_1_simple_function()
-        
-        # Uncomment to run more examples
-        # example_2_class_design()
-        # example_3_api_integration()
+        asyncio.run(run_examples())
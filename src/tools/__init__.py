@@ -21,14 +21,37 @@ Usage:
     result = registry.execute("code_cleaner", context, code=generated_code)
 """
 
+import importlib
+
 from .base import Tool, ToolResult, ToolContext, FileTool
 from .registry import ToolRegistry, get_registry
 
-# Import all tools for easy access
-from .utilities.code_cleaner import CodeCleanerTool, CodeSplitterTool
-from .generators.csharp_generator import CSharpProjectGeneratorTool
-from .generators.python_generator import PythonProjectGeneratorTool
-from .build import BuildTool, BuildAndFixAgent
+# All tools are available from the package, but are only imported on first
+# access so `import tools` just loads the base classes and registry
+_LAZY_IMPORTS = {
+    'CodeCleanerTool': '.utilities.code_cleaner',
+    'CodeSplitterTool': '.utilities.code_cleaner',
+    'StaticAnalysisTool': '.utilities.static_analyzer',
+    'CSharpProjectGeneratorTool': '.generators.csharp_generator',
+    'PythonProjectGeneratorTool': '.generators.python_generator',
+    'BuildTool': '.build',
+    'BuildAndFixAgent': '.build',
+}
+
+
+def __getattr__(name: str):
+    """Import a tool class the first time it is accessed"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 __all__ = [
     # Base classes
@@ -42,6 +65,7 @@ __all__ = [
     # Utility tools
     'CodeCleanerTool',
     'CodeSplitterTool',
+    'StaticAnalysisTool',
 
     # Generator tools
     'CSharpProjectGeneratorTool',
@@ -63,12 +87,19 @@ def register_default_tools(registry: ToolRegistry = None) -> ToolRegistry:
     Returns:
         ToolRegistry with tools registered
     """
+    from .utilities.code_cleaner import CodeCleanerTool, CodeSplitterTool
+    from .utilities.static_analyzer import StaticAnalysisTool
+    from .generators.csharp_generator import CSharpProjectGeneratorTool
+    from .generators.python_generator import PythonProjectGeneratorTool
+    from .build import BuildTool
+
     if registry is None:
         registry = get_registry()
 
     # Register utility tools
     registry.register(CodeCleanerTool())
     registry.register(CodeSplitterTool())
+    registry.register(StaticAnalysisTool())
 
     # Register generator tools
     registry.register(CSharpProjectGeneratorTool())
@@ -10,7 +10,7 @@ from typing import Any, Dict, List, Optional
 import os
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolContext:
     """Context information available to all tools"""
     project_dir: str
@@ -27,7 +27,7 @@ class ToolContext:
         self.working_files[filepath] = content
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Result from executing a tool"""
     success: bool
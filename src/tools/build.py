@@ -4,12 +4,97 @@ Build Tool for C# and Python Projects
 Compiles generated solutions and provides error feedback for LLM-based bug fixing.
 """
 
+import io
 import os
 import subprocess
 import re
-from typing import Dict, List, Optional
+import shutil
+import hashlib
+import py_compile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from langchain_core.messages import HumanMessage
 from .base import Tool, ToolContext, ToolResult
 
+# Pattern: filepath(line,column): error CS####: message
+_CSHARP_ERROR_PATTERN = re.compile(r'([^\(]+)\((\d+),(\d+)\):\s+(error|warning)\s+(\w+\d+):\s+(.+)')
+
+# Pattern: File "path", line N
+_PYTHON_ERROR_PATTERN = re.compile(r'File "([^"]+)", line (\d+)')
+
+# Limits on how much dotnet build output is kept and parsed per build
+_MAX_BUILD_OUTPUT_LINES = 4096
+_MAX_BUILD_ERRORS = 50
+
+# Number of errors returned to the caller and sent to the LLM
+_MAX_REPORTED_ERRORS = 5
+
+# Number of changed Python files at which syntax checks move from threads
+# to a process pool
+_PROCESS_POOL_MIN_FILES = 64
+
+# Build output directories left out of source tree hashes; __pycache__ is
+# written by the concurrent Python check while the C# tree is hashed
+_UNHASHED_DIRS = ('bin', 'obj', '__pycache__')
+
+# Fenced code block in an LLM response
+_CODE_BLOCK_PATTERN = re.compile(r'```(?:\w+)?\n(.*?)```', re.DOTALL)
+
+
+def _iter_python_files(root: str):
+    """Yield the .py files under root, skipping __pycache__ and hidden directories"""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith('.') and entry.name != '__pycache__':
+                    yield from _iter_python_files(entry.path)
+            elif entry.name[-3:] == '.py' and entry.is_file():
+                yield entry.path
+
+
+@lru_cache(maxsize=512)
+def _relative_path(path: str, start: str) -> str:
+    """os.path.relpath, memoized since one file usually reports many errors"""
+    return os.path.relpath(path, start)
+
+
+def _unique_errors(errors: List[Dict]) -> List[Dict]:
+    """Drop repeated errors (same file, line, code and message), keeping order"""
+    seen = set()
+    unique = []
+    for error in errors:
+        key = (error['file'], error['line'], error['code'], error['message'])
+        if key not in seen:
+            seen.add(key)
+            unique.append(error)
+    return unique
+
+
+def _hash_source_tree(root: str) -> bytes:
+    """Hash the paths and contents of a project's sources, skipping build outputs"""
+    digest = hashlib.blake2b(digest_size=16)
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d not in _UNHASHED_DIRS)
+        for file in sorted(files):
+            path = os.path.join(directory, file)
+            try:
+                with open(path, 'rb') as f:
+                    content = f.read()
+            except FileNotFoundError:
+                # Removed since the walk listed it (e.g. a compiler temp file)
+                continue
+            digest.update(os.path.relpath(path, root).encode('utf-8'))
+            digest.update(content)
+    return digest.digest()
+
+
+def _code_digest(code: str) -> bytes:
+    """Short content hash used to recognise code versions that were already built"""
+    return hashlib.blake2b(code.encode('utf-8'), digest_size=16).digest()
+
 
 class BuildTool(Tool):
     """
@@ -25,6 +110,8 @@ class BuildTool(Tool):
             name="build_tool",
             description="Builds C# solutions and Python projects, returns build errors for LLM fixing"
         )
+        # Resolved once rather than searching PATH on every build
+        self._dotnet = shutil.which("dotnet")
 
     def execute(
         self,
@@ -39,7 +126,7 @@ class BuildTool(Tool):
         Args:
             context: Tool context with project_dir
             project_dir: Directory containing the project (defaults to context.project_dir)
-            language: Project language ('csharp' or 'python')
+            language: Project language ('csharp', 'python' or 'both')
             max_iterations: Maximum build-fix iterations
 
         Returns:
@@ -51,6 +138,8 @@ class BuildTool(Tool):
             return self._build_csharp(context, project_dir, max_iterations)
         elif language == "python":
             return self._build_python(context, project_dir, max_iterations)
+        elif language == "both":
+            return self._build_polyglot(context, project_dir, max_iterations)
         else:
             return ToolResult.fail(f"Unsupported language: {language}")
 
@@ -76,33 +165,55 @@ class BuildTool(Tool):
         if not sln_file:
             return ToolResult.fail(f"No .sln file found in {project_dir}")
 
+        if not self._dotnet:
+            return ToolResult.fail("dotnet CLI not found on PATH")
+
         print(f"\n[BUILD] Building solution: {sln_file}")
 
-        all_errors = []
+        # Only the most recent errors are reported back
+        recent_errors = deque(maxlen=_MAX_REPORTED_ERRORS)
         build_output = ""
         success = False
 
         for iteration in range(1, max_iterations + 1):
             print(f"\n[BUILD] Attempt {iteration}/{max_iterations}...")
 
-            # Run dotnet build
-            result = subprocess.run(
-                ["dotnet", "build", sln_file, "--no-incremental"],
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
+            # When the last failure was confined to one project, build just
+            # that project first; the solution build only runs once it passes
+            failed_projects = context.metadata.get('failed_projects', set())
+            if len(failed_projects) == 1:
+                target = next(iter(failed_projects))
+                print(f"[BUILD] Building failed project first: {os.path.basename(target)}")
+                returncode, build_output = self._run_dotnet_build(target)
+                if returncode == 0:
+                    returncode, build_output = self._run_dotnet_build(sln_file)
+            else:
+                returncode, build_output = self._run_dotnet_build(sln_file)
+
+            # Incremental builds trust MSBuild's up-to-date checks. A pass on
+            # sources that already failed to build means stale outputs, so
+            # confirm it with one clean build.
+            tree_hash = _hash_source_tree(project_dir)
+            failed_trees = context.metadata.setdefault('failed_tree_hashes', set())
+            if returncode == 0 and tree_hash in failed_trees:
+                print("[BUILD] Unchanged sources that failed before now pass, rebuilding clean...")
+                returncode, build_output = self._run_dotnet_build(sln_file, clean=True)
+            if returncode != 0:
+                failed_trees.add(tree_hash)
 
-            build_output = result.stdout + result.stderr
             errors = self._parse_csharp_errors(build_output, project_dir)
+            context.metadata['failed_projects'] = {
+                project for project in (self._find_project_file(error['file'], project_dir) for error in errors)
+                if project
+            }
 
-            if result.returncode == 0:
+            if returncode == 0:
                 print(f"[BUILD] SUCCESS on attempt {iteration}!")
                 success = True
                 break
             else:
                 print(f"[BUILD] FAILED with {len(errors)} error(s)")
-                all_errors.extend(errors)
+                recent_errors.extend(errors)
 
                 # For now, we just report errors - the LLM will need to fix them
                 # In a future enhancement, we could integrate with the LLM here
@@ -114,8 +225,7 @@ class BuildTool(Tool):
                 else:
                     print(f"[BUILD] Max iterations reached")
 
-        # Clean up context
-        errors_for_llm = all_errors[-5:] if len(all_errors) > 5 else all_errors
+        errors_for_llm = list(recent_errors)
 
         if success:
             return ToolResult.ok(
@@ -138,7 +248,7 @@ class BuildTool(Tool):
                 'success': False,
                 'iterations': max_iterations,
                 'build_output': build_output,
-                'errors': all_errors,
+                'errors': errors_for_llm,
                 'errors_for_llm': errors_text
             }
             return result
@@ -162,37 +272,42 @@ class BuildTool(Tool):
         """
         print(f"\n[BUILD] Validating Python project: {project_dir}")
 
-        all_errors = []
-        success = True
+        # Only the most recent errors are reported back
+        recent_errors = deque(maxlen=_MAX_REPORTED_ERRORS)
+        success = False
 
         # Find all .py files
-        py_files = []
-        for root, dirs, files in os.walk(project_dir):
-            # Skip __pycache__ and hidden directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d != '__pycache__']
-            for file in files:
-                if file.endswith('.py'):
-                    py_files.append(os.path.join(root, file))
+        py_files = list(_iter_python_files(project_dir))
 
         if not py_files:
             return ToolResult.fail(f"No Python files found in {project_dir}")
 
+        # Files that compiled cleanly, by modification time. Kept on the
+        # context so repeated builds only re-check files that changed.
+        clean_mtimes = context.metadata.setdefault('py_clean_mtimes', {})
+
         for iteration in range(1, max_iterations + 1):
             print(f"\n[BUILD] Validation attempt {iteration}/{max_iterations}...")
 
-            errors = []
-            for py_file in py_files:
-                # Syntax check
-                result = subprocess.run(
-                    ["python", "-m", "py_compile", py_file],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
+            mtimes = {py_file: os.stat(py_file).st_mtime_ns for py_file in py_files}
+            changed = [py_file for py_file in py_files if clean_mtimes.get(py_file) != mtimes[py_file]]
 
-                if result.returncode != 0:
-                    error_msg = self._parse_python_error(result.stderr, py_file)
-                    errors.append(error_msg)
+            # Syntax check without spawning an interpreter per file. Compiling
+            # holds the GIL, so large batches use one process per CPU like
+            # compileall's workers=0; small ones only overlap file reads.
+            errors = []
+            if changed:
+                if len(changed) >= _PROCESS_POOL_MIN_FILES:
+                    executor = ProcessPoolExecutor()
+                else:
+                    executor = ThreadPoolExecutor(max_workers=min(32, len(changed)))
+                with executor:
+                    for py_file, error in zip(changed, executor.map(self._check_python_file, changed, chunksize=8)):
+                        if error:
+                            errors.append(error)
+                            clean_mtimes.pop(py_file, None)
+                        else:
+                            clean_mtimes[py_file] = mtimes[py_file]
 
             if not errors:
                 print(f"[BUILD] Python validation successful!")
@@ -200,14 +315,14 @@ class BuildTool(Tool):
                 break
             else:
                 print(f"[BUILD] FAILED with {len(errors)} error(s)")
-                all_errors.extend(errors)
+                recent_errors.extend(errors)
 
                 if iteration < max_iterations:
                     context.metadata['build_errors'] = errors
                 else:
                     print(f"[BUILD] Max iterations reached")
 
-        errors_for_llm = all_errors[-5:] if len(all_errors) > 5 else all_errors
+        errors_for_llm = list(recent_errors)
 
         if success:
             return ToolResult.ok(
@@ -221,16 +336,139 @@ class BuildTool(Tool):
             )
         else:
             errors_text = self._format_errors_for_llm(errors_for_llm)
-            return ToolResult.fail(
-                f"Python validation failed",
+            result = ToolResult.fail(
+                f"Python validation failed"
+            )
+            # Add data to the result object
+            result.data = {
+                'success': False,
+                'iterations': max_iterations,
+                'errors': errors_for_llm,
+                'errors_for_llm': errors_text
+            }
+            return result
+
+    def _build_polyglot(
+        self,
+        context: ToolContext,
+        project_dir: str,
+        max_iterations: int
+    ) -> ToolResult:
+        """
+        Build the C# solution and validate the Python files of a mixed project.
+
+        Both are mostly waiting on dotnet and file I/O, so when the project
+        has both they run concurrently and their results are merged.
+
+        Args:
+            context: Tool context
+            project_dir: Directory containing the .sln file and Python files
+            max_iterations: Maximum build-fix iterations
+
+        Returns:
+            ToolResult with the combined build status and errors
+        """
+        builds = []
+        if self._find_solution_file(project_dir):
+            builds.append(self._build_csharp)
+        if next(_iter_python_files(project_dir), None):
+            builds.append(self._build_python)
+
+        if not builds:
+            return ToolResult.fail(f"No .sln or Python files found in {project_dir}")
+        if len(builds) == 1:
+            return builds[0](context, project_dir, max_iterations)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            csharp_result, python_result = executor.map(
+                lambda build: build(context, project_dir, max_iterations),
+                builds
+            )
+
+        build_output = csharp_result.data.get('build_output', '') if csharp_result.data else ''
+
+        if csharp_result.success and python_result.success:
+            return ToolResult.ok(
+                "C# build and Python validation successful",
                 data={
-                    'success': False,
-                    'iterations': max_iterations,
-                    'errors': all_errors,
-                    'errors_for_llm': errors_text
+                    'success': True,
+                    'iterations': max(csharp_result.data['iterations'], python_result.data['iterations']),
+                    'build_output': build_output,
+                    'errors': [],
+                    'errors_for_llm': ""
                 }
             )
 
+        failed = [r for r in (csharp_result, python_result) if not r.success]
+        errors = [error for r in failed if r.data for error in r.data['errors']]
+        result = ToolResult.fail(
+            "; ".join(r.message for r in failed)
+        )
+        # Add data to the result object
+        result.data = {
+            'success': False,
+            'iterations': max_iterations,
+            'build_output': build_output,
+            'errors': errors,
+            'errors_for_llm': self._format_errors_for_llm(errors)
+        }
+        return result
+
+    def _run_dotnet_build(self, target: str, clean: bool = False, timeout: int = 120) -> Tuple[int, str]:
+        """
+        Run dotnet build on a solution or project file, streaming its output.
+
+        Only the last _MAX_BUILD_OUTPUT_LINES lines are kept, and the build is
+        stopped early once _MAX_BUILD_ERRORS errors have been reported.
+
+        Builds are incremental (unless clean) and leave the MSBuild nodes
+        and compiler server running, so later builds (e.g. each build-and-fix
+        attempt) only recompile what changed on an already warm toolchain.
+
+        Returns:
+            Tuple of (returncode, build_output)
+        """
+        command = [self._dotnet, "build", target, "--nologo", "-v:q", "-clp:ErrorsOnly;NoSummary",
+                   "-nodeReuse:true", "-maxcpucount"]
+        if clean:
+            command.append("--no-incremental")
+
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        )
+        timer = threading.Timer(timeout, process.kill)
+        timer.start()
+
+        lines = deque(maxlen=_MAX_BUILD_OUTPUT_LINES)
+        error_count = 0
+        try:
+            for line in process.stdout:
+                lines.append(line)
+                if _CSHARP_ERROR_PATTERN.search(line):
+                    error_count += 1
+                    if error_count >= _MAX_BUILD_ERRORS:
+                        # Enough to act on; the rest would not be sent to the LLM
+                        process.kill()
+                        break
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+            timer.cancel()
+
+        return returncode, "".join(lines)
+
+    def _check_python_file(self, py_file: str) -> Optional[Dict]:
+        """Syntax check a Python file, returning an error dict if it does not compile"""
+        try:
+            py_compile.compile(py_file, doraise=True)
+        except py_compile.PyCompileError as e:
+            return self._parse_python_error(e.msg, py_file)
+        return None
+
     def _find_solution_file(self, project_dir: str) -> Optional[str]:
         """Find .sln file in directory"""
         for file in os.listdir(project_dir):
@@ -238,30 +476,39 @@ class BuildTool(Tool):
                 return os.path.join(project_dir, file)
         return None
 
+    def _find_project_file(self, file_path: str, project_dir: str) -> Optional[str]:
+        """Find the .csproj that contains a file reported in a build error"""
+        if file_path == 'unknown':
+            return None
+
+        project_dir = os.path.abspath(project_dir)
+        directory = os.path.dirname(os.path.join(project_dir, file_path))
+        while directory.startswith(project_dir) and os.path.isdir(directory):
+            for file in os.listdir(directory):
+                if file.endswith('.csproj'):
+                    return os.path.join(directory, file)
+            if directory == project_dir:
+                break
+            directory = os.path.dirname(directory)
+        return None
+
     def _parse_csharp_errors(self, build_output: str, project_dir: str) -> List[Dict]:
         """
         Parse C# build errors from output.
 
         Returns list of error dicts with file, line, column, code, message
         """
-        errors = []
-        # Pattern: filepath(line,column): error CS####: message
-        pattern = r'([^\(]+)\((\d+),(\d+)\):\s+(error|warning)\s+(\w+\d+):\s+(.+)'
-
-        for match in re.finditer(pattern, build_output):
-            filepath, line, column, severity, code, message = match.groups()
-
-            # Make path relative
-            rel_path = os.path.relpath(filepath.strip(), project_dir)
-
-            errors.append({
-                'file': rel_path,
+        errors = [
+            {
+                'file': _relative_path(filepath.strip(), project_dir),
                 'line': int(line),
                 'column': int(column),
                 'severity': severity,
                 'code': code,
                 'message': message.strip()
-            })
+            }
+            for filepath, line, column, severity, code, message in _CSHARP_ERROR_PATTERN.findall(build_output)
+        ]
 
         # Also catch errors without line numbers
         if not errors:
@@ -277,18 +524,16 @@ class BuildTool(Tool):
                         'message': line.strip()
                     })
 
-        return errors
+        return _unique_errors(errors)
 
     def _parse_python_error(self, error_output: str, filepath: str) -> Dict:
         """Parse Python syntax error"""
-        # Pattern: File "path", line N
-        pattern = r'File "([^"]+)", line (\d+)'
-        match = re.search(pattern, error_output)
+        match = _PYTHON_ERROR_PATTERN.search(error_output)
 
         if match:
             line_num = int(match.group(2))
             # Extract error message
-            error_msg = error_output.split('\n')[-1].strip()
+            error_msg = error_output.strip().split('\n')[-1].strip()
 
             return {
                 'file': os.path.basename(filepath),
@@ -313,20 +558,25 @@ class BuildTool(Tool):
         if not errors:
             return ""
 
-        formatted = ["BUILD ERRORS (fix these in your code):"]
-        formatted.append("=" * 60)
+        # Same error reported more than once only costs prompt tokens;
+        # list errors before warnings
+        errors = sorted(_unique_errors(errors), key=lambda error: error['severity'] != 'error')
+
+        formatted = io.StringIO()
+        formatted.write("BUILD ERRORS (fix these in your code):\n")
+        formatted.write("=" * 60 + "\n")
 
         for i, error in enumerate(errors, 1):
-            formatted.append(f"\n{i}. {error['severity'].upper()} {error['code']}")
-            formatted.append(f"   File: {error['file']}")
+            formatted.write(f"\n{i}. {error['severity'].upper()} {error['code']}\n")
+            formatted.write(f"   File: {error['file']}\n")
             if error['line'] > 0:
-                formatted.append(f"   Line: {error['line']}")
-            formatted.append(f"   Issue: {error['message']}")
+                formatted.write(f"   Line: {error['line']}\n")
+            formatted.write(f"   Issue: {error['message']}\n")
 
-        formatted.append("\n" + "=" * 60)
-        formatted.append("\nPlease provide corrected code that fixes these build errors.")
+        formatted.write("\n" + "=" * 60 + "\n")
+        formatted.write("\nPlease provide corrected code that fixes these build errors.")
 
-        return "\n".join(formatted)
+        return formatted.getvalue()
 
 
 class BuildAndFixAgent:
@@ -375,8 +625,13 @@ class BuildAndFixAgent:
         current_code = code
         errors_for_llm = ""
 
+        # Digests of every code version already built, so a fix that brings
+        # back a version that already failed is not rebuilt
+        built_versions = set()
+
         for iteration in range(1, self.max_iterations + 1):
             print(f"\n[BUILD & FIX] Iteration {iteration}/{self.max_iterations}")
+            built_versions.add(_code_digest(current_code))
 
             # First, save the code to files if this is a revision
             if iteration > 1:
@@ -406,7 +661,7 @@ class BuildAndFixAgent:
             print(f"[BUILD & FIX] Requesting LLM to fix errors...")
             fixed_code = self._ask_llm_to_fix(current_code, errors_for_llm, language)
 
-            if not fixed_code or fixed_code == current_code:
+            if not fixed_code or _code_digest(fixed_code) in built_versions:
                 print(f"[BUILD & FIX] LLM did not provide different code")
                 # Try one more time with stronger prompt
                 fixed_code = self._ask_llm_to_fix(
@@ -415,6 +670,11 @@ class BuildAndFixAgent:
                     language
                 )
 
+                if not fixed_code or _code_digest(fixed_code) in built_versions:
+                    # Rebuilding code that already failed cannot succeed
+                    print(f"[BUILD & FIX] LLM still did not provide new code, stopping")
+                    return False, current_code, build_result
+
             current_code = fixed_code
 
         return False, current_code, build_result
@@ -440,7 +700,6 @@ Please provide the COMPLETE corrected code that fixes all build errors.
 
 FIXED CODE:"""
 
-        from langchain_core.messages import HumanMessage
         response = self.llm.invoke([HumanMessage(content=prompt)])
 
         # Extract code from response
@@ -448,8 +707,7 @@ FIXED CODE:"""
 
         # Remove markdown code blocks if present
         if "```" in fixed_code:
-            import re
-            matches = re.findall(r'```(?:\w+)?\n(.*?)```', fixed_code, re.DOTALL)
+            matches = _CODE_BLOCK_PATTERN.findall(fixed_code)
             if matches:
                 fixed_code = matches[0]
 
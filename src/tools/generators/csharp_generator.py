@@ -5,193 +5,28 @@ Creates complete Visual Studio solution structure for C# projects.
 """
 
 import os
-import re
-import uuid
+import string
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List
 from ..base import Tool, ToolContext, ToolResult
-from ..utilities.code_cleaner import CodeCleanerTool, CodeSplitterTool
+from ..utilities.code_cleaner import CodeCleanerTool
 
+# Deletes every ASCII character not allowed in a C# project name
+_CSHARP_NAME_CHARS = frozenset(string.ascii_letters + string.digits + '_.')
+_SANITIZE_CSHARP = str.maketrans('', '', ''.join(chr(c) for c in range(128) if chr(c) not in _CSHARP_NAME_CHARS))
 
-class CSharpProjectGeneratorTool(Tool):
-    """
-    Tool for generating C# Visual Studio projects.
-    
-    Creates:
-    - .sln solution file
-    - .csproj project files
-    - .cs source files
-    - Test project with NUnit
-    - .gitignore
-    - README.md
-    """
-    
-    def __init__(self):
-        super().__init__(
-            name="csharp_project_generator",
-            description="Generates complete C# Visual Studio solution structure"
-        )
-    
-    def execute(
-        self,
-        context: ToolContext,
-        code: str = None,
-        test_code: str = None,
-        project_name: str = None,
-        target_framework: str = "net10.0"
-    ) -> ToolResult:
-        """
-        Generate C# project structure.
-        
-        Args:
-            context: Tool context with project_dir
-            code: Main project code
-            test_code: Test project code
-            project_name: Name for the project (uses folder name if not provided)
-            target_framework: .NET target framework
-            
-        Returns:
-            ToolResult with list of created files
-        """
-        try:
-            project_dir = context.project_dir
-            
-            # Use folder name as project name if not provided
-            if project_name is None:
-                project_name = self._get_folder_name(project_dir)
-            
-            # Clean the code once
-            cleaner = CodeCleanerTool()
-            cleaner_result = cleaner.execute(context, code=code, language='csharp')
-            if cleaner_result.success:
-                code = cleaner_result.data['cleaned_code']
-            
-            if test_code:
-                test_cleaner_result = cleaner.execute(context, code=test_code, language='csharp')
-                if test_cleaner_result.success:
-                    test_code = test_cleaner_result.data['cleaned_code']
-            
-            # Split code into files
-            splitter = CodeSplitterTool()
-            files = {}
-            test_files = {}
-            
-            if code:
-                split_result = splitter.execute(context, code=code, language='csharp')
-                if split_result.success:
-                    # Filter out test files from main code
-                    all_files = split_result.data['files']
-                    for filename, content in all_files.items():
-                        # Check if this is a test file
-                        if 'Test' in filename or 'Tests' in filename:
-                            test_files[filename] = content
-                        else:
-                            files[filename] = content
-            
-            if test_code:
-                test_split_result = splitter.execute(context, code=test_code, language='csharp')
-                if test_split_result.success:
-                    test_files.update(test_split_result.data['files'])
-            
-            # Create directory structure
-            main_dir = os.path.join(project_dir, project_name)
-            test_dir = os.path.join(project_dir, f"{project_name}.Tests")
-            
-            os.makedirs(main_dir, exist_ok=True)
-            os.makedirs(test_dir, exist_ok=True)
-            
-            created_files = []
-            
-            # Generate .csproj for main project
-            csproj_path = os.path.join(main_dir, f"{project_name}.csproj")
-            self._write_csproj(csproj_path, project_name, target_framework)
-            created_files.append(csproj_path)
-            
-            # Generate .csproj for test project
-            test_csproj_path = os.path.join(test_dir, f"{project_name}.Tests.csproj")
-            self._write_test_csproj(test_csproj_path, project_name, target_framework)
-            created_files.append(test_csproj_path)
-            
-            # Generate .sln file
-            sln_path = os.path.join(project_dir, f"{project_name}.sln")
-            self._write_solution(sln_path, project_name)
-            created_files.append(sln_path)
-            
-            # Write C# source files
-            for filename, content in files.items():
-                filepath = os.path.join(main_dir, filename)
-                self._write_file(filepath, content)
-                created_files.append(filepath)
-            
-            # Write test files
-            for filename, content in test_files.items():
-                filepath = os.path.join(test_dir, filename)
-                self._write_file(filepath, content)
-                created_files.append(filepath)
-            
-            # Create .gitignore
-            gitignore_path = os.path.join(project_dir, ".gitignore")
-            self._write_gitignore(gitignore_path)
-            created_files.append(gitignore_path)
-            
-            # Create README
-            readme_path = os.path.join(project_dir, "README.md")
-            self._write_readme(readme_path, project_name)
-            created_files.append(readme_path)
-            
-            return ToolResult.ok(
-                f"C# project '{project_name}' created successfully",
-                data={
-                    'project_name': project_name,
-                    'main_dir': main_dir,
-                    'test_dir': test_dir
-                },
-                files_created=created_files
-            )
-            
-        except Exception as e:
-            return ToolResult.fail(f"Error generating C# project: {str(e)}")
-    
-    def _get_folder_name(self, project_dir: str) -> str:
-        """
-        Get project name from folder path.
-        
-        Args:
-            project_dir: Full path to project directory
-            
-        Returns:
-            Folder name sanitized for use as project name
-        """
-        import re
-        # Get the last folder name
-        folder_name = os.path.basename(os.path.normpath(project_dir))
-        
-        # If empty (root path), use parent folder
-        if not folder_name:
-            folder_name = os.path.basename(os.path.dirname(project_dir))
-        
-        # Sanitize: remove invalid chars, keep only alphanumeric
-        folder_name = re.sub(r'[^a-zA-Z0-9_.]', '', folder_name)
-        
-        # Ensure it starts with a letter
-        if folder_name and not folder_name[0].isalpha():
-            folder_name = 'App' + folder_name
-        
-        # Default fallback
-        if not folder_name:
-            folder_name = 'GeneratedApp'
-        
-        # Limit length
-        return folder_name[:50]
-    
-    def _write_file(self, filepath: str, content: str):
-        """Write content to file"""
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-    
-    def _write_csproj(self, filepath: str, project_name: str, target_framework: str):
-        """Write .csproj file"""
-        content = f'''<Project Sdk="Microsoft.NET.Sdk">
+# Generated files are small, so writes are I/O-bound and overlap well
+_WRITE_WORKERS = 8
+
+# O_BINARY only exists (and matters) on Windows
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+# Stateless, so one instance is shared by every generation
+_CLEANER = CodeCleanerTool()
+
+# Static file templates, filled in with str.format where needed
+_CSPROJ_TEMPLATE = '''<Project Sdk="Microsoft.NET.Sdk">
 
   <PropertyGroup>
     <OutputType>Exe</OutputType>
@@ -203,11 +38,8 @@ class CSharpProjectGeneratorTool(Tool):
 
 </Project>
 '''
-        self._write_file(filepath, content)
-    
-    def _write_test_csproj(self, filepath: str, project_name: str, target_framework: str):
-        """Write test .csproj file"""
-        content = f'''<Project Sdk="Microsoft.NET.Sdk">
+
+_TEST_CSPROJ_TEMPLATE = '''<Project Sdk="Microsoft.NET.Sdk">
 
   <PropertyGroup>
     <TargetFramework>{target_framework}</TargetFramework>
@@ -233,14 +65,8 @@ class CSharpProjectGeneratorTool(Tool):
 
 </Project>
 '''
-        self._write_file(filepath, content)
-    
-    def _write_solution(self, filepath: str, project_name: str):
-        """Write .sln file"""
-        main_guid = str(uuid.uuid4()).upper()
-        test_guid = str(uuid.uuid4()).upper()
-        
-        content = f'''Microsoft Visual Studio Solution File, Format Version 12.00
+
+_SLN_TEMPLATE = '''Microsoft Visual Studio Solution File, Format Version 12.00
 # Visual Studio Version 17
 VisualStudioVersion = 17.0.31903.59
 MinimumVisualStudioVersion = 10.0.40219.1
@@ -268,11 +94,8 @@ Global
 	EndGlobalSection
 EndGlobal
 '''
-        self._write_file(filepath, content)
-    
-    def _write_gitignore(self, filepath: str):
-        """Write .gitignore file"""
-        content = '''## Visual Studio / .NET
+
+_GITIGNORE_CSHARP = '''## Visual Studio / .NET
 .vs/
 *.user
 *.suo
@@ -305,11 +128,8 @@ bld/
 *.swp
 *.swo
 '''
-        self._write_file(filepath, content)
-    
-    def _write_readme(self, filepath: str, project_name: str):
-        """Write README.md file"""
-        content = f'''# {project_name}
+
+_README_TEMPLATE = '''# {project_name}
 
 Generated by AI Agent Software Team
 
@@ -345,4 +165,242 @@ dotnet test {project_name}.sln
     └── *.cs
 ```
 '''
+
+# Constant files are encoded once at import
+_GITIGNORE_CSHARP_BYTES = _GITIGNORE_CSHARP.encode('utf-8')
+
+
+def _new_guid() -> str:
+    """Random upper-case GUID in the version 4 layout used by .sln files"""
+    h = os.urandom(16).hex().upper()
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89AB'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
+
+
+@lru_cache(maxsize=256)
+def _sanitize_csharp_folder(project_dir: str) -> str:
+    """Sanitize the folder name of project_dir for use as a project name (memoized)"""
+    # Get the last folder name
+    folder_name = os.path.basename(os.path.normpath(project_dir))
+    
+    # If empty (root path), use parent folder
+    if not folder_name:
+        folder_name = os.path.basename(os.path.dirname(project_dir))
+    
+    # Sanitize: remove invalid chars, keep only alphanumeric
+    folder_name = folder_name.translate(_SANITIZE_CSHARP)
+    if not folder_name.isascii():
+        folder_name = folder_name.encode('ascii', 'ignore').decode('ascii')
+    
+    # Ensure it starts with a letter
+    if folder_name and not folder_name[0].isalpha():
+        folder_name = 'App' + folder_name
+    
+    # Default fallback
+    if not folder_name:
+        folder_name = 'GeneratedApp'
+    
+    # Limit length
+    return folder_name[:50]
+
+
+class CSharpProjectGeneratorTool(Tool):
+    """
+    Tool for generating C# Visual Studio projects.
+    
+    Creates:
+    - .sln solution file
+    - .csproj project files
+    - .cs source files
+    - Test project with NUnit
+    - .gitignore
+    - README.md
+    """
+    
+    def __init__(self):
+        super().__init__(
+            name="csharp_project_generator",
+            description="Generates complete C# Visual Studio solution structure"
+        )
+    
+    def execute(
+        self,
+        context: ToolContext,
+        code: str = None,
+        test_code: str = None,
+        project_name: str = None,
+        target_framework: str = "net10.0",
+        already_split: bool = False
+    ) -> ToolResult:
+        """
+        Generate C# project structure.
+        
+        Args:
+            context: Tool context with project_dir
+            code: Main project code
+            test_code: Test project code
+            project_name: Name for the project (uses folder name if not provided)
+            target_framework: .NET target framework
+            already_split: True if code holds no test classes, so its files
+                skip the test-file classification
+            
+        Returns:
+            ToolResult with list of created files
+        """
+        try:
+            project_dir = context.project_dir
+            
+            # Use folder name as project name if not provided
+            if project_name is None:
+                project_name = self._get_folder_name(project_dir)
+            
+            # Clean and split code into files, as (files, from_test_code) pairs
+            split_sources = []
+            
+            if code:
+                split_result = _CLEANER.clean_and_split(code, language='csharp')
+                if split_result.success:
+                    split_sources.append((split_result.data['files'], False))
+            
+            if test_code:
+                test_split_result = _CLEANER.clean_and_split(test_code, language='csharp')
+                if test_split_result.success:
+                    split_sources.append((test_split_result.data['files'], True))
+            
+            # Sort everything into the main and test projects in one pass:
+            # all of test_code is tests, main code is filtered by filename
+            # unless the caller already separated the two
+            files = {}
+            test_files = {}
+            for split_files, from_test_code in split_sources:
+                for filename, content in split_files.items():
+                    # Check if this is a test file ('Tests' contains 'Test')
+                    if from_test_code or (not already_split and 'Test' in filename):
+                        test_files[filename] = content
+                    else:
+                        files[filename] = content
+            
+            # Create directory structure
+            main_dir = os.path.join(project_dir, project_name)
+            test_dir = os.path.join(project_dir, f"{project_name}.Tests")
+            
+            # Queue every file as (writer, filepath, *args) so they can be
+            # written concurrently
+            writes = [
+                # .csproj for main and test projects
+                (self._write_csproj, os.path.join(main_dir, f"{project_name}.csproj"),
+                 project_name, target_framework),
+                (self._write_test_csproj, os.path.join(test_dir, f"{project_name}.Tests.csproj"),
+                 project_name, target_framework),
+                # .sln file
+                (self._write_solution, os.path.join(project_dir, f"{project_name}.sln"), project_name),
+            ]
+            
+            # Splitter filenames are bare names, so plain concatenation is
+            # enough for the source and test paths
+            main_prefix = main_dir + os.sep
+            test_prefix = test_dir + os.sep
+            
+            # C# source files
+            for filename, content in files.items():
+                writes.append((self._write_file, main_prefix + filename, content))
+            
+            # Test files
+            for filename, content in test_files.items():
+                writes.append((self._write_file, test_prefix + filename, content))
+            
+            # .gitignore and README
+            writes.append((self._write_gitignore, os.path.join(project_dir, ".gitignore")))
+            writes.append((self._write_readme, os.path.join(project_dir, "README.md"), project_name))
+            
+            created_files = self._write_all(writes)
+            
+            return ToolResult.ok(
+                f"C# project '{project_name}' created successfully",
+                data={
+                    'project_name': project_name,
+                    'main_dir': main_dir,
+                    'test_dir': test_dir
+                },
+                files_created=created_files
+            )
+            
+        except Exception as e:
+            return ToolResult.fail(f"Error generating C# project: {str(e)}")
+    
+    def _get_folder_name(self, project_dir: str) -> str:
+        """
+        Get project name from folder path.
+        
+        Args:
+            project_dir: Full path to project directory
+            
+        Returns:
+            Folder name sanitized for use as project name
+        """
+        return _sanitize_csharp_folder(project_dir)
+    
+    def _write_all(self, writes: List[tuple]) -> List[str]:
+        """
+        Run queued file writes on a thread pool.
+        
+        Parent directories are created up front so the workers never race
+        on directory creation.
+        
+        Args:
+            writes: (writer, filepath, *args) tuples
+            
+        Returns:
+            Written file paths, in queue order
+        """
+        for dirname in {os.path.dirname(filepath) for _, filepath, *_ in writes}:
+            os.makedirs(dirname, exist_ok=True)
+        
+        with ThreadPoolExecutor(max_workers=_WRITE_WORKERS) as executor:
+            futures = [executor.submit(writer, filepath, *args) for writer, filepath, *args in writes]
+            # Re-raise the first write error, if any
+            for future in futures:
+                future.result()
+        
+        return [filepath for _, filepath, *_ in writes]
+    
+    def _write_file(self, filepath: str, content: str):
+        """Write content to file"""
+        self._write_bytes(filepath, content.encode('utf-8'))
+    
+    def _write_bytes(self, filepath: str, data: bytes):
+        """Write already-encoded content to file (its directory must exist)"""
+        # Write straight to the file descriptor, skipping the file object layers
+        data = memoryview(data)
+        fd = os.open(filepath, _WRITE_FLAGS, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+    
+    def _write_csproj(self, filepath: str, project_name: str, target_framework: str):
+        """Write .csproj file"""
+        content = _CSPROJ_TEMPLATE.format(target_framework=target_framework)
+        self._write_file(filepath, content)
+    
+    def _write_test_csproj(self, filepath: str, project_name: str, target_framework: str):
+        """Write test .csproj file"""
+        content = _TEST_CSPROJ_TEMPLATE.format(project_name=project_name, target_framework=target_framework)
+        self._write_file(filepath, content)
+    
+    def _write_solution(self, filepath: str, project_name: str):
+        """Write .sln file"""
+        main_guid = _new_guid()
+        test_guid = _new_guid()
+        
+        content = _SLN_TEMPLATE.format(project_name=project_name, main_guid=main_guid, test_guid=test_guid)
+        self._write_file(filepath, content)
+    
+    def _write_gitignore(self, filepath: str):
+        """Write .gitignore file"""
+        self._write_bytes(filepath, _GITIGNORE_CSHARP_BYTES)
+    
+    def _write_readme(self, filepath: str, project_name: str):
+        """Write README.md file"""
+        content = _README_TEMPLATE.format(project_name=project_name)
         self._write_file(filepath, content)
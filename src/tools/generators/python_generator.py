@@ -5,10 +5,190 @@ Creates Python project structure with tests.
 """
 
 import os
-import re
-from typing import Dict
+import string
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List
 from ..base import Tool, ToolContext, ToolResult
-from ..utilities.code_cleaner import CodeCleanerTool, CodeSplitterTool
+from ..utilities.code_cleaner import CodeCleanerTool
+
+# Maps every ASCII character not allowed in a Python package name to '_'
+_PY_NAME_CHARS = frozenset(string.ascii_letters + string.digits + '_')
+_SANITIZE_PY = str.maketrans({chr(c): '_' for c in range(128) if chr(c) not in _PY_NAME_CHARS})
+
+# Generated files are small, so writes are I/O-bound and overlap well
+_WRITE_WORKERS = 8
+
+# O_BINARY only exists (and matters) on Windows
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+# Stateless, so one instance is shared by every generation
+_CLEANER = CodeCleanerTool()
+
+# Static file templates, filled in with str.format where needed
+_REQUIREMENTS = '''# Core dependencies
+pytest>=7.0.0
+pytest-cov>=4.0.0
+
+# Add your dependencies below
+# requests>=2.28.0
+'''
+
+_SETUP_TEMPLATE = '''from setuptools import setup, find_packages
+
+setup(
+    name="{project_name}",
+    version="0.1.0",
+    packages=find_packages(),
+    install_requires=[
+        # Add dependencies here
+    ],
+    python_requires=">=3.8",
+)
+'''
+
+_PYPROJECT_TEMPLATE = '''[tool.poetry]
+name = "{project_name}"
+version = "0.1.0"
+description = "Generated by AI Agent Software Team"
+authors = ["AI Agent <ai@example.com>"]
+
+[tool.poetry.dependencies]
+python = "^3.8"
+
+[tool.poetry.group.dev.dependencies]
+pytest = "^7.0.0"
+pytest-cov = "^4.0.0"
+
+[build-system]
+requires = ["poetry-core"]
+build-backend = "poetry.core.masonry.api"
+'''
+
+_GITIGNORE_PY = '''# Python
+__pycache__/
+*.py[cod]
+*$py.class
+*.so
+.Python
+env/
+venv/
+.venv/
+ENV/
+build/
+develop-eggs/
+dist/
+downloads/
+eggs/
+.eggs/
+lib/
+lib64/
+parts/
+sdist/
+var/
+wheels/
+*.egg-info/
+.installed.cfg
+*.egg
+
+# Testing
+.pytest_cache/
+.coverage
+htmlcov/
+.tox/
+
+# IDE
+.idea/
+.vscode/
+*.swp
+*.swo
+
+# OS
+.DS_Store
+Thumbs.db
+'''
+
+_README_TEMPLATE = '''# {project_name}
+
+Generated by AI Agent Software Team
+
+## Installation
+
+### Using pip
+```bash
+pip install -e .
+```
+
+### Using Poetry
+```bash
+poetry install
+```
+
+## Usage
+
+```python
+from {project_name} import main
+```
+
+## Development
+
+### Run tests
+```bash
+pytest
+```
+
+### Run with coverage
+```bash
+pytest --cov={project_name}
+```
+
+## Project Structure
+
+```
+{project_name}/
+├── {project_name}/
+│   ├── __init__.py
+│   └── *.py
+├── tests/
+│   ├── __init__.py
+│   └── test_*.py
+├── requirements.txt
+├── setup.py
+└── README.md
+```
+'''
+
+# Constant files are encoded once at import
+_REQUIREMENTS_BYTES = _REQUIREMENTS.encode('utf-8')
+_GITIGNORE_PY_BYTES = _GITIGNORE_PY.encode('utf-8')
+
+
+@lru_cache(maxsize=256)
+def _sanitize_python_folder(project_dir: str) -> str:
+    """Sanitize the folder name of project_dir for use as a project name (memoized)"""
+    # Get the last folder name
+    folder_name = os.path.basename(os.path.normpath(project_dir))
+    
+    # If empty (root path), use parent folder
+    if not folder_name:
+        folder_name = os.path.basename(os.path.dirname(project_dir))
+    
+    # Sanitize: replace invalid chars with underscore, convert to lowercase
+    folder_name = folder_name.translate(_SANITIZE_PY)
+    if not folder_name.isascii():
+        folder_name = ''.join(c if c.isascii() else '_' for c in folder_name)
+    folder_name = folder_name.lower()
+    
+    # Ensure it starts with a letter
+    if folder_name and not folder_name[0].isalpha():
+        folder_name = 'app_' + folder_name
+    
+    # Default fallback
+    if not folder_name:
+        folder_name = 'generated_app'
+    
+    # Limit length
+    return folder_name[:50]
 
 
 class PythonProjectGeneratorTool(Tool):
@@ -58,30 +238,17 @@ class PythonProjectGeneratorTool(Tool):
             if project_name is None:
                 project_name = self._get_folder_name(project_dir)
             
-            # Clean the code
-            cleaner = CodeCleanerTool()
-            if code:
-                code_result = cleaner.execute(context, code=code, language="python")
-                if code_result.success:
-                    code = code_result.data['cleaned_code']
-            
-            if test_code:
-                test_result = cleaner.execute(context, code=test_code, language="python")
-                if test_result.success:
-                    test_code = test_result.data['cleaned_code']
-            
-            # Split code into files
-            splitter = CodeSplitterTool()
+            # Clean and split code into files
             files = {}
             test_files = {}
             
             if code:
-                split_result = splitter.execute(context, code=code, language="python")
+                split_result = _CLEANER.clean_and_split(code, language="python")
                 if split_result.success:
                     files = split_result.data['files']
             
             if test_code:
-                test_split_result = splitter.execute(context, code=test_code, language="python")
+                test_split_result = _CLEANER.clean_and_split(test_code, language="python")
                 if test_split_result.success:
                     test_files = test_split_result.data['files']
             
@@ -89,59 +256,44 @@ class PythonProjectGeneratorTool(Tool):
             package_dir = os.path.join(project_dir, project_name)
             test_dir = os.path.join(project_dir, "tests")
             
-            os.makedirs(package_dir, exist_ok=True)
-            os.makedirs(test_dir, exist_ok=True)
-            
-            created_files = []
+            # Queue every file as (writer, filepath, *args) so they can be
+            # written concurrently
+            writes = [
+                # __init__.py files
+                (self._write_file, os.path.join(package_dir, "__init__.py"), f'"""{project_name} package"""\\n'),
+                (self._write_file, os.path.join(test_dir, "__init__.py"), '"""Tests package"""\\n'),
+            ]
             
-            # Create __init__.py files
-            init_path = os.path.join(package_dir, "__init__.py")
-            self._write_file(init_path, f'"""{project_name} package"""\\n')
-            created_files.append(init_path)
+            # Splitter filenames are bare names, so plain concatenation is
+            # enough for the source and test paths
+            package_prefix = package_dir + os.sep
+            test_prefix = test_dir + os.sep
             
-            test_init_path = os.path.join(test_dir, "__init__.py")
-            self._write_file(test_init_path, '"""Tests package"""\\n')
-            created_files.append(test_init_path)
-            
-            # Write Python source files
+            # Python source files
             for filename, content in files.items():
-                filepath = os.path.join(package_dir, filename)
-                self._write_file(filepath, content)
-                created_files.append(filepath)
+                writes.append((self._write_file, package_prefix + filename, content))
             
-            # Write test files
+            # Test files
             for filename, content in test_files.items():
                 # Ensure test filename starts with test_
                 if not filename.startswith('test_'):
                     filename = f"test_{filename}"
-                filepath = os.path.join(test_dir, filename)
-                self._write_file(filepath, content)
-                created_files.append(filepath)
+                writes.append((self._write_file, test_prefix + filename, content))
             
-            # Create requirements.txt
-            req_path = os.path.join(project_dir, "requirements.txt")
-            self._write_requirements(req_path)
-            created_files.append(req_path)
+            # requirements.txt
+            writes.append((self._write_requirements, os.path.join(project_dir, "requirements.txt")))
             
-            # Create setup.py or pyproject.toml
+            # setup.py or pyproject.toml
             if use_poetry:
-                pyproject_path = os.path.join(project_dir, "pyproject.toml")
-                self._write_pyproject(pyproject_path, project_name)
-                created_files.append(pyproject_path)
+                writes.append((self._write_pyproject, os.path.join(project_dir, "pyproject.toml"), project_name))
             else:
-                setup_path = os.path.join(project_dir, "setup.py")
-                self._write_setup(setup_path, project_name)
-                created_files.append(setup_path)
+                writes.append((self._write_setup, os.path.join(project_dir, "setup.py"), project_name))
             
-            # Create .gitignore
-            gitignore_path = os.path.join(project_dir, ".gitignore")
-            self._write_gitignore(gitignore_path)
-            created_files.append(gitignore_path)
+            # .gitignore and README
+            writes.append((self._write_gitignore, os.path.join(project_dir, ".gitignore")))
+            writes.append((self._write_readme, os.path.join(project_dir, "README.md"), project_name))
             
-            # Create README
-            readme_path = os.path.join(project_dir, "README.md")
-            self._write_readme(readme_path, project_name)
-            created_files.append(readme_path)
+            created_files = self._write_all(writes)
             
             return ToolResult.ok(
                 f"Python project '{project_name}' created successfully",
@@ -166,177 +318,66 @@ class PythonProjectGeneratorTool(Tool):
         Returns:
             Folder name sanitized for use as project name
         """
-        import re
-        # Get the last folder name
-        folder_name = os.path.basename(os.path.normpath(project_dir))
-        
-        # If empty (root path), use parent folder
-        if not folder_name:
-            folder_name = os.path.basename(os.path.dirname(project_dir))
+        return _sanitize_python_folder(project_dir)
+    
+    def _write_all(self, writes: List[tuple]) -> List[str]:
+        """
+        Run queued file writes on a thread pool.
         
-        # Sanitize: replace invalid chars with underscore, convert to lowercase
-        folder_name = re.sub(r'[^a-zA-Z0-9_]', '_', folder_name).lower()
+        Parent directories are created up front so the workers never race
+        on directory creation.
         
-        # Ensure it starts with a letter
-        if folder_name and not folder_name[0].isalpha():
-            folder_name = 'app_' + folder_name
+        Args:
+            writes: (writer, filepath, *args) tuples
+            
+        Returns:
+            Written file paths, in queue order
+        """
+        for dirname in {os.path.dirname(filepath) for _, filepath, *_ in writes}:
+            os.makedirs(dirname, exist_ok=True)
         
-        # Default fallback
-        if not folder_name:
-            folder_name = 'generated_app'
+        with ThreadPoolExecutor(max_workers=_WRITE_WORKERS) as executor:
+            futures = [executor.submit(writer, filepath, *args) for writer, filepath, *args in writes]
+            # Re-raise the first write error, if any
+            for future in futures:
+                future.result()
         
-        # Limit length
-        return folder_name[:50]
+        return [filepath for _, filepath, *_ in writes]
     
     def _write_file(self, filepath: str, content: str):
         """Write content to file"""
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        self._write_bytes(filepath, content.encode('utf-8'))
+    
+    def _write_bytes(self, filepath: str, data: bytes):
+        """Write already-encoded content to file (its directory must exist)"""
+        # Write straight to the file descriptor, skipping the file object layers
+        data = memoryview(data)
+        fd = os.open(filepath, _WRITE_FLAGS, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
     
     def _write_requirements(self, filepath: str):
         """Write requirements.txt"""
-        content = '''# Core dependencies
-pytest>=7.0.0
-pytest-cov>=4.0.0
-
-# Add your dependencies below
-# requests>=2.28.0
-'''
-        self._write_file(filepath, content)
+        self._write_bytes(filepath, _REQUIREMENTS_BYTES)
     
     def _write_setup(self, filepath: str, project_name: str):
         """Write setup.py"""
-        content = f'''from setuptools import setup, find_packages
-
-setup(
-    name="{project_name}",
-    version="0.1.0",
-    packages=find_packages(),
-    install_requires=[
-        # Add dependencies here
-    ],
-    python_requires=">=3.8",
-)
-'''
+        content = _SETUP_TEMPLATE.format(project_name=project_name)
         self._write_file(filepath, content)
     
     def _write_pyproject(self, filepath: str, project_name: str):
         """Write pyproject.toml for Poetry"""
-        content = f'''[tool.poetry]
-name = "{project_name}"
-version = "0.1.0"
-description = "Generated by AI Agent Software Team"
-authors = ["AI Agent <ai@example.com>"]
-
-[tool.poetry.dependencies]
-python = "^3.8"
-
-[tool.poetry.group.dev.dependencies]
-pytest = "^7.0.0"
-pytest-cov = "^4.0.0"
-
-[build-system]
-requires = ["poetry-core"]
-build-backend = "poetry.core.masonry.api"
-'''
+        content = _PYPROJECT_TEMPLATE.format(project_name=project_name)
         self._write_file(filepath, content)
     
     def _write_gitignore(self, filepath: str):
         """Write .gitignore"""
-        content = '''# Python
-__pycache__/
-*.py[cod]
-*$py.class
-*.so
-.Python
-env/
-venv/
-.venv/
-ENV/
-build/
-develop-eggs/
-dist/
-downloads/
-eggs/
-.eggs/
-lib/
-lib64/
-parts/
-sdist/
-var/
-wheels/
-*.egg-info/
-.installed.cfg
-*.egg
-
-# Testing
-.pytest_cache/
-.coverage
-htmlcov/
-.tox/
-
-# IDE
-.idea/
-.vscode/
-*.swp
-*.swo
-
-# OS
-.DS_Store
-Thumbs.db
-'''
-        self._write_file(filepath, content)
+        self._write_bytes(filepath, _GITIGNORE_PY_BYTES)
     
     def _write_readme(self, filepath: str, project_name: str):
         """Write README.md"""
-        content = f'''# {project_name}
-
-Generated by AI Agent Software Team
-
-## Installation
-
-### Using pip
-```bash
-pip install -e .
-```
-
-### Using Poetry
-```bash
-poetry install
-```
-
-## Usage
-
-```python
-from {project_name} import main
-```
-
-## Development
-
-### Run tests
-```bash
-pytest
-```
-
-### Run with coverage
-```bash
-pytest --cov={project_name}
-```
-
-## Project Structure
-
-```
-{project_name}/
-├── {project_name}/
-│   ├── __init__.py
-│   └── *.py
-├── tests/
-│   ├── __init__.py
-│   └── test_*.py
-├── requirements.txt
-├── setup.py
-└── README.md
-```
-'''
+        content = _README_TEMPLATE.format(project_name=project_name)
         self._write_file(filepath, content)
@@ -4,7 +4,7 @@ Tool Registry
 Central registry for discovering and using agent tools.
 """
 
-from typing import Dict, List, Optional, Type
+from typing import Callable, Dict, List, Optional, Type
 from .base import Tool, ToolContext, ToolResult
 
 
@@ -16,14 +16,22 @@ class ToolRegistry:
     by agents.
     """
     
+    __slots__ = ('_tools', '_bound', '_info')
+    
     _instance: Optional['ToolRegistry'] = None
     _tools: Dict[str, Tool]
+    # Bound execute methods by tool name, so execute() is a single lookup
+    _bound: Dict[str, Callable[..., ToolResult]]
+    # Tool info by name, built once at registration
+    _info: Dict[str, Dict]
     
     def __new__(cls):
         """Singleton pattern"""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._tools = {}
+            cls._instance._bound = {}
+            cls._instance._info = {}
         return cls._instance
     
     @classmethod
@@ -39,6 +47,12 @@ class ToolRegistry:
             tool: Tool instance to register
         """
         self._tools[tool.name] = tool
+        self._bound[tool.name] = tool.execute
+        self._info[tool.name] = {
+            'name': tool.name,
+            'description': tool.description,
+            'class': tool.__class__.__name__
+        }
     
     def register_class(self, tool_class: Type[Tool], **kwargs):
         """
@@ -79,14 +93,14 @@ class ToolRegistry:
         Raises:
             KeyError: If tool not found
         """
-        tool = self.get(name)
-        if tool is None:
+        execute = self._bound.get(name)
+        if execute is None:
             return ToolResult.fail(f"Tool not found: {name}")
-        return tool.execute(context, **kwargs)
+        return execute(context, **kwargs)
     
     def list_tools(self) -> List[str]:
         """List all registered tool names"""
-        return list(self._tools.keys())
+        return list(self._tools)
     
     def get_tool_info(self, name: str) -> Optional[Dict]:
         """
@@ -98,14 +112,9 @@ class ToolRegistry:
         Returns:
             Dict with tool info or None
         """
-        tool = self.get(name)
-        if tool is None:
-            return None
-        return {
-            'name': tool.name,
-            'description': tool.description,
-            'class': tool.__class__.__name__
-        }
+        info = self._info.get(name)
+        # Copy, so callers can't change the cached info
+        return dict(info) if info is not None else None
     
     def __contains__(self, name: str) -> bool:
         """Check if tool is registered"""
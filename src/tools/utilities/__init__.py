@@ -1,4 +1,5 @@
 """Utility tools"""
 from .code_cleaner import CodeCleanerTool, CodeSplitterTool
+from .static_analyzer import StaticAnalysisTool
 
-__all__ = ['CodeCleanerTool', 'CodeSplitterTool']
+__all__ = ['CodeCleanerTool', 'CodeSplitterTool', 'StaticAnalysisTool']
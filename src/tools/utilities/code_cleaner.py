@@ -6,9 +6,183 @@ code fences, and other artifacts.
 """
 
 import re
-from typing import List, Dict, Tuple
+from functools import lru_cache, partial
+from typing import Callable, List, Dict, Tuple
 from ..base import Tool, ToolContext, ToolResult
 
+# Markdown/AI artifacts stripped by CodeCleanerTool
+_RE_FENCE_LANG = re.compile(r'```[a-z]*\n')
+_RE_FENCE = re.compile(r'```\n?')
+_RE_HEADER = re.compile(r'^##+\s+', re.MULTILINE)
+_RE_FILE_MARKER_MD = re.compile(r'^##\s*`?[\w\.]+`?\s*$', re.MULTILINE)
+_RE_FILE_MARKER_C = re.compile(r'^//\s*(Filename|File):\s*[\w\.]+\s*$', re.MULTILINE)
+_RE_INTRO = re.compile(r"^(?:Here's|Below is).*?\n+", re.IGNORECASE | re.MULTILINE)
+_RE_BLANKS = re.compile(r'\n\s*\n\s*\n')
+# A line whose stripped text starts and ends with a backtick
+_RE_BACKTICK_LINE = re.compile(r'^[^\S\n]*`(?:[^\n]*`)?[^\S\n]*$', re.MULTILINE)
+
+# Documentation lines that are clearly not code, judged on the stripped line:
+# '# '/'## '/'### ' headers, '- '/'* ' list items and 'As a ' need something
+# after the space, emoji bullets and 'I will' match on their own
+_RE_SKIP_LINE = re.compile(
+    r'^[^\S\n]*(?:(?:#{1,3}|[-*]|As a) [^\n]*\S|[✅🧪📁]|I will)[^\n]*(?:\n|\Z)',
+    re.MULTILINE
+)
+
+# Cheap pre-scan for _clean_code: a line that could start a header, list
+# item, emoji bullet, role description or intro. Together with the '```'
+# and 'File' checks it covers every artifact pattern above, so input it
+# doesn't match can skip straight to the language hook
+_RE_ANY_MARKER = re.compile(
+    r"^(?:[^\S\n]*(?:[#*\-✅🧪📁]|As a |I will)|(?i:Here's|Below is))",
+    re.MULTILINE
+)
+
+# Substring hints for language and test detection. Separate `in` scans run
+# at C speed and beat a combined regex alternation in CPython
+_CSHARP_HINTS = ('namespace ', 'using System;', 'public class', 'static void Main')
+_TEST_MARKERS = ('[TestFixture]', '[Test]', '[TestCase]', 'NUnit', 'Assert.', 'Tests')
+
+# Using statements added to C# code that lacks them, with the markers that
+# show each one is needed (Console/exceptions, LINQ, collections, Regex,
+# Task/async, NUnit attributes). Each using appears once
+_USING_HINTS = (
+    ('using System;', ('Console.', 'ArgumentNullException', 'ArgumentException')),
+    ('using System.Linq;', ('IEnumerable', '.ToList()', '.Select(')),
+    ('using System.Collections.Generic;', ('List<', 'Dictionary<')),
+    ('using System.Text.RegularExpressions;', ('Regex.',)),
+    ('using System.Threading.Tasks;', ('Task<', 'async ')),
+    ('using NUnit.Framework;', ('[Test]', '[TestFixture]', '[TestCase]')),
+)
+
+# File extension by language, for unsplit single-file output
+_EXTENSIONS = {
+    'csharp': '.cs',
+    'python': '.py',
+    'javascript': '.js',
+    'java': '.java',
+    'typescript': '.ts'
+}
+
+# Inputs at least this large may use the optional numba brace scanner
+_COMPILED_SCAN_MIN_CHARS = 1 << 20
+
+# File boundaries and class names used by CodeSplitterTool
+_RE_CS_FILE = re.compile(r'//\s*File:\s*([\w\.]+\.cs)\s*\n', re.IGNORECASE)
+_RE_CS_CLASS = re.compile(r'(?:public\s+)?(?:static\s+)?class\s+(\w+)')
+_RE_CS_TEST_CLASS = re.compile(r'public\s+class\s+(\w+Tests)')
+_RE_PY_FILE = re.compile(r'#\s*File:\s*([\w\.]+\.py)\s*\n', re.IGNORECASE)
+
+
+def _detect_code_language(code: str) -> str:
+    """Detect programming language from code content"""
+    # C# indicators
+    if any(x in code for x in _CSHARP_HINTS):
+        return 'csharp'
+    
+    # Python indicators
+    if 'def ' in code and ('import ' in code or 'class ' in code):
+        return 'python'
+    
+    # JavaScript indicators
+    if 'function ' in code or 'const ' in code or 'let ' in code:
+        return 'javascript'
+    
+    # Java indicators
+    if 'public static void main' in code and 'String[] args' in code:
+        return 'java'
+    
+    return 'unknown'
+
+
+def _find_block_end(code: str, start: int) -> int:
+    """
+    Find the end of the first brace-delimited block at or after start.
+    
+    Jumps between braces with str.find instead of walking every character.
+    
+    Returns:
+        Index just past the closing brace, or -1 if the block never closes
+    """
+    depth = 0
+    started = False
+    next_open = code.find('{', start)
+    next_close = code.find('}', start)
+    
+    while next_open != -1 or next_close != -1:
+        if next_close == -1 or (next_open != -1 and next_open < next_close):
+            depth += 1
+            started = True
+            pos = next_open
+            next_open = code.find('{', pos + 1)
+        else:
+            depth -= 1
+            pos = next_close
+            next_close = code.find('}', pos + 1)
+        
+        if started and depth == 0:
+            return pos + 1
+    
+    return -1
+
+
+def _scan_block_end_bytes(buf: bytes, start: int) -> int:
+    """
+    Byte-wise twin of _find_block_end for ASCII buffers.
+    
+    Written for numba's nopython mode; see _load_compiled_scanner.
+    """
+    depth = 0
+    started = False
+    for i in range(start, len(buf)):
+        char = buf[i]
+        if char == 123:  # '{'
+            depth += 1
+            started = True
+        elif char == 125:  # '}'
+            depth -= 1
+        else:
+            continue
+        
+        if started and depth == 0:
+            return i + 1
+    
+    return -1
+
+
+@lru_cache(maxsize=None)
+def _load_compiled_scanner():
+    """
+    Compile _scan_block_end_bytes with numba, if it is installed.
+    
+    numba is optional and imported on first use only, so ordinary imports
+    of this module don't pay for it.
+    
+    Returns:
+        The compiled scanner, or None if numba is unavailable
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_scan_block_end_bytes)
+
+
+def _block_end_finder(code: str) -> Callable[[int], int]:
+    """
+    Pick the block-end scanner for code.
+    
+    Very large ASCII inputs use the numba-compiled byte scanner when numba
+    is available (byte and character offsets agree for ASCII); everything
+    else uses the str.find based _find_block_end.
+    """
+    if len(code) >= _COMPILED_SCAN_MIN_CHARS and code.isascii():
+        scanner = _load_compiled_scanner()
+        if scanner is not None:
+            buf = code.encode('ascii')
+            return lambda start: scanner(buf, start)
+    return partial(_find_block_end, code)
+
 
 class CodeCleanerTool(Tool):
     """
@@ -26,6 +200,7 @@ class CodeCleanerTool(Tool):
             name="code_cleaner",
             description="Cleans AI-generated code by removing markdown formatting"
         )
+        self._splitter = CodeSplitterTool()
     
     def execute(self, context: ToolContext, code: str = None, language: str = "auto") -> ToolResult:
         """
@@ -57,78 +232,47 @@ class CodeCleanerTool(Tool):
         except Exception as e:
             return ToolResult.fail(f"Error cleaning code: {str(e)}")
     
-    def _detect_language(self, code: str) -> str:
-        """Detect programming language from code content"""
-        code_lower = code.lower()
-        
-        # C# indicators
-        if any(x in code for x in ['namespace ', 'using System;', 'public class', 'static void Main']):
-            return 'csharp'
-        
-        # Python indicators
-        if 'def ' in code and ('import ' in code or 'class ' in code):
-            return 'python'
+    def clean_and_split(self, code: str, language: str = "auto") -> ToolResult:
+        """
+        Clean code and split it into files in one call.
         
-        # JavaScript indicators
-        if 'function ' in code or 'const ' in code or 'let ' in code:
-            return 'javascript'
+        Equivalent to running execute() and then CodeSplitterTool.execute()
+        on the cleaned code, but the language is detected once and the
+        cleaned text goes straight to the splitter.
         
-        # Java indicators
-        if 'public static void main' in code and 'String[] args' in code:
-            return 'java'
+        Args:
+            code: Code to clean and split
+            language: Language hint ('csharp', 'python', 'auto')
+            
+        Returns:
+            ToolResult with dict of {filename: content}
+        """
+        if code is None:
+            return ToolResult.fail("No code provided to clean")
         
-        return 'unknown'
+        try:
+            if language == "auto":
+                language = self._detect_language(code)
+            
+            files = self._splitter._split_code(self._clean_code(code, language), language)
+            
+            return ToolResult.ok(
+                f"Code cleaned and split into {len(files)} files",
+                data={'files': files, 'language': language}
+            )
+        except Exception as e:
+            return ToolResult.fail(f"Error cleaning code: {str(e)}")
+    
+    @staticmethod
+    def _detect_language(code: str) -> str:
+        """Detect programming language from code content"""
+        return _detect_code_language(code)
     
     def _clean_code(self, code: str, language: str) -> str:
         """Clean code based on language"""
-        # Remove markdown code fences
-        code = re.sub(r'```[a-z]*\n', '\n', code)
-        code = re.sub(r'```\n?', '', code)
-
-        # Remove markdown headers that appear in code
-        code = re.sub(r'^##+\s+', '', code, flags=re.MULTILINE)
-
-        # Remove file markers like "## Filename.cs" or "// File: xxx.cs"
-        code = re.sub(r'^##\s*`?[\w\.]+`?\s*$', '', code, flags=re.MULTILINE)
-        code = re.sub(r'^//\s*(Filename|File):\s*[\w\.]+\s*$', '', code, flags=re.MULTILINE)
-
-        # Remove "Here's..." introductory text
-        code = re.sub(r"^Here's.*?\n+", '', code, flags=re.IGNORECASE | re.MULTILINE)
-        code = re.sub(r"^Below is.*?\n+", '', code, flags=re.IGNORECASE | re.MULTILINE)
-        
-        # Remove AI response preamble and markdown documentation
-        # Filter out lines that are clearly documentation, not code
-        lines = code.split('\n')
-        filtered_lines = []
-        
-        for line in lines:
-            stripped = line.strip()
-            
-            # Always keep using statements and namespace declarations
-            if stripped.startswith('using ') or stripped.startswith('namespace '):
-                filtered_lines.append(line)
-                continue
-            
-            # Skip markdown headers
-            if stripped.startswith('# ') or stripped.startswith('## ') or stripped.startswith('### '):
-                continue
-            
-            # Skip list items
-            if stripped.startswith('- ') or stripped.startswith('* '):
-                continue
-            
-            # Skip emoji-prefixed lines
-            if stripped.startswith('✅') or stripped.startswith('🧪') or stripped.startswith('📁'):
-                continue
-            
-            # Skip AI role descriptions
-            if stripped.startswith('As a ') or stripped.startswith('I will'):
-                continue
-            
-            # Keep the line
-            filtered_lines.append(line)
-        
-        code = '\n'.join(filtered_lines)
+        # Already-clean code only needs the language hook and final tidy-up
+        if '```' in code or 'File' in code or _RE_ANY_MARKER.search(code):
+            code = self._strip_artifacts(code)
 
         # Language-specific cleaning
         if language == 'csharp':
@@ -137,34 +281,51 @@ class CodeCleanerTool(Tool):
             code = self._clean_python(code)
 
         # Clean up multiple blank lines
-        code = re.sub(r'\n\s*\n\s*\n', '\n\n', code)
+        code = _RE_BLANKS.sub('\n\n', code)
 
         # Trim whitespace
         code = code.strip()
 
         return code
     
+    def _strip_artifacts(self, code: str) -> str:
+        """Remove markdown and AI response artifacts"""
+        # Remove markdown code fences
+        code = _RE_FENCE_LANG.sub('\n', code)
+        code = _RE_FENCE.sub('', code)
+
+        # Stripping a header run can uncover another one ("## ## Title") or a
+        # line the later patterns remove, so repeat until no header is left
+        headers = True
+        while headers:
+            headers = 0
+            
+            # Line-anchored patterns can't use sre's literal-prefix search, so
+            # skip them when the literal they need is absent
+            if '##' in code:
+                # Remove markdown headers that appear in code
+                code, headers = _RE_HEADER.subn('', code)
+                
+                # Remove file markers like "## Filename.cs"
+                code = _RE_FILE_MARKER_MD.sub('', code)
+            
+            # Remove file markers like "// File: xxx.cs"
+            if 'File' in code:
+                code = _RE_FILE_MARKER_C.sub('', code)
+
+            # Remove "Here's..." / "Below is..." introductory text
+            code = _RE_INTRO.sub('', code)
+            
+            # Remove AI response preamble and markdown documentation lines
+            # (headers, list items, emoji bullets, role descriptions) in one pass
+            code = _RE_SKIP_LINE.sub('', code)
+
+        return code
+    
     def _clean_csharp(self, code: str) -> str:
         """Clean C# specific artifacts"""
-        # Remove markdown code fences first
-        code = re.sub(r'```[a-z]*\n', '\n', code)
-        code = re.sub(r'```\n?', '', code)
-        
-        # Remove markdown headers that appear in code
-        code = re.sub(r'^##+\s+', '', code, flags=re.MULTILINE)
-        
-        # Remove file markers like "## Filename.cs" or "// File: xxx.cs"
-        code = re.sub(r'^##\s*`?[\w\.]+`?\s*$', '', code, flags=re.MULTILINE)
-        code = re.sub(r'^//\s*(Filename|File):\s*[\w\.]+\s*$', '', code, flags=re.MULTILINE)
-        
-        # Remove "Here's..." introductory text
-        code = re.sub(r"^Here's.*?\n+", '', code, flags=re.IGNORECASE | re.MULTILINE)
-        code = re.sub(r"^Below is.*?\n+", '', code, flags=re.IGNORECASE | re.MULTILINE)
-        
-        # Clean up multiple blank lines but preserve single ones
-        code = re.sub(r'\n\s*\n\s*\n', '\n\n', code)
-        
-        # Trim whitespace but preserve structure
+        # _clean_code has already removed fences, headers, file markers and
+        # intro text; only trim so the using check sees the first real line
         code = code.strip()
         
         # Add common using statements if missing
@@ -177,64 +338,36 @@ class CodeCleanerTool(Tool):
         if not code:
             return code
         
-        # Check if code already has using statements
-        has_usings = 'using ' in code.split('\n')[0:5]
+        # Check if code already has using statements near the top; only the
+        # head is read, the rest of the code is never split
+        head = code[:512]
+        has_usings = head.startswith('using ') or '\nusing ' in head
         if has_usings:
             return code
         
-        # Common using statements to add
-        needed_usings = []
-        
-        # Check for Console usage
-        if 'Console.' in code:
-            needed_usings.append('using System;')
-        
-        # Check for LINQ usage
-        if 'IEnumerable' in code or '.ToList()' in code or '.Select(' in code:
-            needed_usings.append('using System.Linq;')
-        if 'List<' in code or 'Dictionary<' in code:
-            needed_usings.append('using System.Collections.Generic;')
-        
-        # Check for Exception types
-        if 'ArgumentNullException' in code or 'ArgumentException' in code:
-            needed_usings.append('using System;')
+        # Common using statements to add, one probe per using until a
+        # marker is found
+        needed_usings = [
+            using for using, markers in _USING_HINTS
+            if any(marker in code for marker in markers)
+        ]
         
-        # Check for Regex usage
-        if 'Regex.' in code or 'Regex.IsMatch' in code:
-            needed_usings.append('using System.Text.RegularExpressions;')
-        
-        # Check for Task/async usage
-        if 'Task<' in code or 'async ' in code:
-            needed_usings.append('using System.Threading.Tasks;')
-        
-        # Check for NUnit test attributes
-        if '[Test]' in code or '[TestFixture]' in code or '[TestCase]' in code:
-            needed_usings.append('using NUnit.Framework;')
-        
-        # Check for Moq usage
-        if 'Mock<' in code or '.Object' in code and 'Moq' in code:
+        # Check for Moq usage: Mock<T> is specific enough on its own, the
+        # common '.Object' only counts if Moq is mentioned
+        if 'Mock<' in code or ('Moq' in code and '.Object' in code):
             needed_usings.append('using Moq;')
         
         if needed_usings:
-            # Remove duplicates and add at the beginning
-            unique_usings = list(dict.fromkeys(needed_usings))
-            using_block = '\n'.join(unique_usings) + '\n'
-            code = using_block + '\n' + code
+            code = '\n'.join(needed_usings) + '\n\n' + code
         
         return code
     
     def _clean_python(self, code: str) -> str:
         """Clean Python specific artifacts"""
-        # Remove markdown backticks
-        lines = code.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
-            if line.strip().startswith('`') and line.strip().endswith('`'):
-                line = line.strip('`').strip()
-            cleaned_lines.append(line)
-        
-        return '\n'.join(cleaned_lines)
+        # Remove markdown backticks from lines wrapped in them
+        if '`' not in code:
+            return code
+        return _RE_BACKTICK_LINE.sub(lambda m: m.group().strip('`').strip(), code)
 
 
 class CodeSplitterTool(Tool):
@@ -270,9 +403,7 @@ class CodeSplitterTool(Tool):
         
         try:
             if language == "auto":
-                # Import here to avoid circular dependency
-                cleaner = CodeCleanerTool()
-                language = cleaner._detect_language(code)
+                language = CodeCleanerTool._detect_language(code)
             
             files = self._split_code(code, language)
             
@@ -301,15 +432,8 @@ class CodeSplitterTool(Tool):
         """Split C# code into files"""
         files = {}
         
-        # First, check if this looks like test code (contains NUnit attributes)
-        is_test_code = any(x in code for x in [
-            '[TestFixture]', '[Test]', '[TestCase]', 
-            'NUnit', 'Assert.', 'Tests'
-        ])
-        
         # Pattern 1: Look for file markers like "// File: xxx.cs"
-        file_pattern = r'//\s*File:\s*([\w\.]+\.cs)\s*\n'
-        matches = list(re.finditer(file_pattern, code, re.IGNORECASE))
+        matches = list(_RE_CS_FILE.finditer(code))
         
         if matches:
             # Split by file markers
@@ -321,51 +445,33 @@ class CodeSplitterTool(Tool):
                 
                 files[filename] = content
         else:
-            # Pattern 2: Split by namespace/class declarations
-            # Find all class declarations
-            class_pattern = r'(?:public\s+)?(?:static\s+)?class\s+(\w+)'
-            class_matches = list(re.finditer(class_pattern, code))
-            
-            if class_matches:
-                for i, match in enumerate(class_matches):
-                    class_name = match.group(1)
-                    start = match.start()
-                    
-                    # Find end of this class
-                    brace_count = 0
-                    end = start
-                    started = False
-                    
-                    for j, char in enumerate(code[start:]):
-                        if char == '{':
-                            brace_count += 1
-                            started = True
-                        elif char == '}':
-                            brace_count -= 1
-                        
-                        if started and brace_count == 0:
-                            end = start + j + 1
-                            break
-                    
-                    if end == start:
-                        end = len(code)
-                    
-                    content = code[start:end].strip()
-                    
-                    # Determine filename based on class name and content
-                    if is_test_code or class_name.endswith('Tests') or class_name.endswith('Test'):
-                        filename = f"{class_name}.cs"
-                    elif class_name == 'Program':
-                        filename = "Program.cs"
-                    else:
-                        filename = f"{class_name}.cs"
-                    
-                    files[filename] = content
-            else:
-                # Pattern 3: Check if entire code is test code
-                if is_test_code:
+            # Pattern 2: Split by namespace/class declarations, walking the
+            # class declarations lazily; the scanner is only picked once a
+            # class is actually found
+            find_block_end = None
+            for match in _RE_CS_CLASS.finditer(code):
+                if find_block_end is None:
+                    find_block_end = _block_end_finder(code)
+                class_name = match.group(1)
+                start = match.start()
+
+                # Find end of this class
+                end = find_block_end(start)
+                if end == -1:
+                    end = len(code)
+
+                content = code[start:end].strip()
+
+                # Test classes, Program and everything else are all
+                # named after the class
+                files[f"{class_name}.cs"] = content
+
+            if find_block_end is None:
+                # Pattern 3: Check if entire code is test code (contains NUnit
+                # attributes); only this fallback needs the extra scans
+                if any(x in code for x in _TEST_MARKERS):
                     # Try to find test class name
-                    test_match = re.search(r'public\s+class\s+(\w+Tests)', code)
+                    test_match = _RE_CS_TEST_CLASS.search(code)
                     if test_match:
                         files[f"{test_match.group(1)}.cs"] = code
                     else:
@@ -381,8 +487,7 @@ class CodeSplitterTool(Tool):
         files = {}
         
         # Look for file markers
-        file_pattern = r'#\s*File:\s*([\w\.]+\.py)\s*\n'
-        matches = list(re.finditer(file_pattern, code, re.IGNORECASE))
+        matches = list(_RE_PY_FILE.finditer(code))
         
         if matches:
             for i, match in enumerate(matches):
@@ -398,11 +503,4 @@ class CodeSplitterTool(Tool):
     
     def _get_extension(self, language: str) -> str:
         """Get file extension for language"""
-        extensions = {
-            'csharp': '.cs',
-            'python': '.py',
-            'javascript': '.js',
-            'java': '.java',
-            'typescript': '.ts'
-        }
-        return extensions.get(language, '.txt')
+        return _EXTENSIONS.get(language, '.txt')
@@ -0,0 +1,157 @@
+"""
+Static Analysis Tool
+
+Runs cheap local checks (ast, ruff, bandit) on generated Python code so
+simple reviews can be decided without an LLM call.
+"""
+
+import ast
+import re
+import shutil
+import subprocess
+from typing import List
+from ..base import Tool, ToolContext, ToolResult
+
+# A markdown fence line and the language tag on it, if any
+_RE_FENCE = re.compile(r'^[ \t]*```[ \t]*([\w+#.-]*)[^\n]*(?:\n|\Z)', re.MULTILINE)
+
+# Fence tags whose blocks are analyzed as Python ('' is an untagged block)
+_PYTHON_TAGS = ('python', 'py', '')
+
+
+class StaticAnalysisTool(Tool):
+    """
+    Tool for statically analyzing generated Python code.
+
+    Checks:
+    - Syntax (ast.parse)
+    - Lint errors (ruff, if installed)
+    - Security issues of medium severity or higher (bandit, if installed)
+
+    The verdict is 'approved' only when every check ran and found nothing,
+    'needs_revision' when any check reported findings, and 'inconclusive'
+    when a linter is unavailable or the code is not Python.
+    """
+
+    def __init__(self):
+        super().__init__(
+            name="static_analyzer",
+            description="Runs ast, ruff and bandit on Python code and reports findings"
+        )
+
+    def execute(self, context: ToolContext, code: str = None, language: str = "python") -> ToolResult:
+        """
+        Statically analyze code.
+
+        Args:
+            context: Tool context
+            code: Code to analyze (may contain markdown code fences)
+            language: Code language (only 'python' is analyzed)
+
+        Returns:
+            ToolResult with verdict, findings and the checks that ran
+        """
+        if code is None:
+            return ToolResult.fail("No code provided to analyze")
+
+        if language != "python":
+            return ToolResult.ok(
+                f"Static analysis not supported for {language}",
+                data={'verdict': 'inconclusive', 'findings': [], 'checks': []}
+            )
+
+        findings = []
+        checks = []
+
+        # Blocks in one answer usually build on each other (a usage example
+        # calling a function defined earlier), so they are linted together
+        # as one module
+        blocks = []
+        for block in self._extract_code_blocks(code):
+            # Syntax check - linters are pointless on code that does not parse
+            try:
+                ast.parse(block)
+            except SyntaxError as e:
+                findings.append(f"SyntaxError line {e.lineno}: {e.msg}")
+                continue
+            blocks.append(block)
+
+        if blocks:
+            module = "\n\n".join(blocks)
+            ruff_args = ["check", "--isolated", "--quiet", "--select=E4,E7,E9,F", "--no-cache",
+                         "--output-format=concise", "--stdin-filename", "generated.py", "-"]
+            if len(blocks) > 1:
+                # Later blocks may import or redefine names again
+                ruff_args.insert(1, "--ignore=E402,F811")
+
+            findings.extend(self._run_linter("ruff", ruff_args, module, checks))
+            findings.extend(self._run_linter(
+                "bandit",
+                ["-q", "-ll", "-f", "custom", "--msg-template", "line {line}: {test_id} {msg}", "-"],
+                module,
+                checks
+            ))
+
+        if findings:
+            verdict = 'needs_revision'
+        elif {'ruff', 'bandit'} <= set(checks):
+            verdict = 'approved'
+        else:
+            verdict = 'inconclusive'
+
+        return ToolResult.ok(
+            f"Static analysis {verdict} with {len(findings)} finding(s)",
+            data={'verdict': verdict, 'findings': findings, 'checks': sorted(set(checks))}
+        )
+
+    def _extract_code_blocks(self, code: str) -> List[str]:
+        """
+        Get the Python code blocks from markdown, or the whole text if unfenced.
+
+        Fences are paired strictly as open/close, so the text between two
+        blocks is never mistaken for code. Only blocks tagged python/py or
+        left untagged are returned; an unclosed last block runs to the end.
+        """
+        fences = list(_RE_FENCE.finditer(code))
+        if not fences:
+            return [code]
+
+        blocks = []
+        for i in range(0, len(fences), 2):
+            opening = fences[i]
+            if opening.group(1).lower() not in _PYTHON_TAGS:
+                continue
+            end = fences[i + 1].start() if i + 1 < len(fences) else len(code)
+            blocks.append(code[opening.end():end])
+        return blocks
+
+    def _run_linter(self, tool: str, args: List[str], code: str, checks: List[str]) -> List[str]:
+        """
+        Run a linter on code passed through stdin.
+
+        Returns the reported findings; records the tool in checks only if it
+        actually ran.
+        """
+        executable = shutil.which(tool)
+        if not executable:
+            return []
+
+        try:
+            result = subprocess.run(
+                [executable, *args],
+                input=code,
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return []
+
+        # Both tools exit 0 when clean and 1 when they found issues
+        if result.returncode not in (0, 1):
+            return []
+
+        checks.append(tool)
+        if result.returncode == 0:
+            return []
+        return [f"{tool}: {line.strip()}" for line in result.stdout.splitlines() if line.strip()]